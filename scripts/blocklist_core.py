@@ -0,0 +1,114 @@
+"""
+blocklist_core.py — Hot loops of build_blocklist.py, kept mypyc-compatible.
+
+Everything here is plain, fully annotated Python with no optional imports,
+so it runs as-is but can also be compiled to a C extension for large
+blocklists:
+
+    pip install mypy
+    cd scripts && mypyc blocklist_core.py
+
+The compiled module lands next to this file and Python imports it in
+preference to the .py source; delete it (blocklist_core.*.so / .pyd) to go
+back to the interpreted version.
+"""
+
+import pathlib
+from typing import Sequence
+
+# ── Blocklist parsing ─────────────────────────────────────────────────────────
+
+DISCOVERY_MARKER = "DISCOVERED DOMAINS — generated"
+
+
+def parse_blocklist(path: pathlib.Path) -> tuple[list[str], set[str], int | None]:
+    """
+    Returns (lines, known_domains, generated_start).
+
+    `lines` preserves the full file structure (comments, blank lines, domain
+    entries) but silently drops any line whose domain already appeared earlier
+    in the file (intra-file deduplication).
+
+    `known_domains` is the lowercased set of all domain names in the file.
+
+    `generated_start` is the index in `lines` where a previous run's generated
+    section begins (including the blank lines before its header), or None.
+    """
+    raw_lines = path.read_text(encoding="utf-8").split("\n")
+    if raw_lines[-1] == "":
+        raw_lines.pop()           # trailing newline, not an extra empty line
+
+    lines: list[str] = []
+    known: set[str] = set()
+    generated_start: int | None = None
+
+    for line in raw_lines:
+        stripped = line.strip()
+
+        if not stripped or stripped[0] == "#":
+            if generated_start is None and DISCOVERY_MARKER in line:
+                # Walk back to include the preceding blank lines too.
+                generated_start = len(lines)
+                while generated_start > 0 and lines[generated_start - 1].strip() == "":
+                    generated_start -= 1
+            lines.append(line)
+            continue
+
+        # Support both "domain.com" and "0.0.0.0 domain.com" formats; take
+        # the text after the last space, as the app's parser does.
+        domain = stripped.rpartition(" ")[2].lower()
+
+        if domain in known:
+            # Drop the duplicate silently.
+            continue
+
+        known.add(domain)
+        lines.append(line)
+
+    return lines, known, generated_start
+
+
+def is_blocked(domain: str, known: set[str]) -> bool:
+    """
+    Return True if `domain` or any parent domain is in `known`.
+
+    Mirrors BlocklistManager.isBlocked() in the app: an entry blocks every
+    subdomain beneath it.
+    """
+    while True:
+        if domain in known:
+            return True
+        dot = domain.find(".")
+        if dot < 0:
+            return False
+        domain = domain[dot + 1:]
+
+# ── Discovery ─────────────────────────────────────────────────────────────────
+
+def build_probe_list(
+    seeds: list[str],
+    dead_seeds: set[str],
+    wildcard_seeds: set[str],
+    known: set[str],
+    prefixes: Sequence[str],
+) -> list[str]:
+    """
+    Expand each seed into prefix + seed for every entry of `prefixes` (which
+    carry their trailing dot), skipping any candidate already in `known`.
+
+    Seeds themselves are not included (they are probed up front), and seeds
+    in `dead_seeds` (NXDOMAIN) or `wildcard_seeds` (wildcard zone — every
+    prefix would falsely resolve) are not expanded at all.
+
+    Candidates are ordered prefix-major (cdn.a, cdn.b, …, static.a, …) so
+    consecutive probes go to different vendors' nameservers rather than
+    bursting ~100 queries at one of them.
+    """
+    expand = [s for s in seeds if s not in dead_seeds and s not in wildcard_seeds]
+    # dict.fromkeys() deduplicates while keeping first-seen order.
+    candidates = dict.fromkeys(p + s for p in prefixes for s in expand)
+
+    # `known` must stay an exact set: it is also what parse_blocklist()
+    # deduplicates against, where a false positive would drop a real entry.
+    seed_set = set(seeds)
+    return [c for c in candidates if c not in seed_set and c not in known]
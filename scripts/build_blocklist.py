@@ -6,30 +6,50 @@ Reads  : scripts/vendors.txt  (seed domains, one per line; # lines are comments)
 Merges : app/src/main/assets/blocklists/manipulation-blocklist.txt
 Writes : app/src/main/assets/blocklists/manipulation-blocklist.txt (updated in-place)
 
+Caches : scripts/.dns_cache.json (probe results reused across runs; gitignored)
+
 Usage:
     python scripts/build_blocklist.py [--dry-run] [--verbose] [--workers N] [--timeout S]
+                                      [--no-cache] [--cache-ttl D] [--interval S]
+                                      [--nameserver IP ...]
 
     --dry-run    Print discovered domains but do not write to the blocklist.
     --verbose    Log every probe result, not just new discoveries.
-    --workers N  Parallel DNS workers (default: 50).
+    --workers N  Concurrent DNS queries (default: 2000 with aiodns, 500 with
+                 dnspython, else 50).
     --timeout S  DNS query timeout in seconds (default: 3).
-
-Optional dependency (recommended for accurate NXDOMAIN detection):
-    pip install dnspython
+    --no-cache   Ignore and do not update the DNS result cache.
+    --cache-ttl D  Reuse cached live results for D days (default: 7). Negative
+                 results are reused for at most 1 day.
+    --interval S Minimum gap between DNS queries in seconds (default: 0, no limit).
+    --nameserver IP  Resolver to query; repeat for several (default: 1.1.1.1,
+                 8.8.8.8 and 9.9.9.9). Ignored by the socket fallback.
+
+Optional dependencies (recommended, in order of preference):
+    pip install aiodns       # async queries — thousands in flight on one thread
+    pip install dnspython    # async queries via dns.asyncresolver
 """
 
 import argparse
+import asyncio
 import datetime
+import json
 import pathlib
+import secrets
 import socket
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence, TextIO
+
+from blocklist_core import build_probe_list, is_blocked, parse_blocklist
 
 # ── Paths ─────────────────────────────────────────────────────────────────────
 
 SCRIPT_DIR    = pathlib.Path(__file__).parent.resolve()
 REPO_ROOT     = SCRIPT_DIR.parent
 VENDORS_FILE  = SCRIPT_DIR / "vendors.txt"
+CACHE_FILE    = SCRIPT_DIR / ".dns_cache.json"
 BLOCKLIST_FILE = REPO_ROOT / "app/src/main/assets/blocklists/manipulation-blocklist.txt"
 
 # ── Subdomain prefixes to probe ───────────────────────────────────────────────
@@ -68,161 +88,336 @@ PREFIXES = [
     "us1", "us2", "eu1", "eu2",
 ]
 
+# PREFIXES with the joining dot already attached (and duplicates dropped), so
+# expanding a seed costs one concatenation per candidate.
+_DOTTED_PREFIXES = tuple(p + "." for p in dict.fromkeys(PREFIXES))
+
 # ── DNS helpers ───────────────────────────────────────────────────────────────
 
+# Public resolvers queried by default, in rotation. Using them rather than the
+# system resolver keeps results independent of local search domains and
+# misconfigured forwarders (e.g. corporate DNS on CI runners).
+DEFAULT_NAMESERVERS = ("1.1.1.1", "8.8.8.8", "9.9.9.9")
+
+# Probe outcomes.
+LIVE     = "live"       # name resolves
+NXDOMAIN = "nxdomain"   # name (and therefore everything under it) does not exist
+MISS     = "miss"       # name may exist but has no address records
+ERROR    = "error"      # no usable answer: timeout, SERVFAIL, refused…
+
 try:
-    import dns.resolver
+    import aiodns
+    import aiodns.error
+    _HAS_AIODNS = True
+except ImportError:
+    _HAS_AIODNS = False
+
+# c-ares status codes carried in aiodns.error.DNSError.args[0].
+_ARES_ENODATA  = 1    # name exists but has no record of the queried type
+_ARES_ENOTFOUND = 4   # NXDOMAIN
+
+try:
+    import dns.asyncresolver
     import dns.exception
+    import dns.rdatatype
+    import dns.resolver
     _HAS_DNSPYTHON = True
 except ImportError:
     _HAS_DNSPYTHON = False
 
 
-def _resolves_dnspython(fqdn: str, timeout: float) -> bool:
-    resolver = dns.resolver.Resolver()
-    resolver.lifetime = timeout
-    for rtype in ("A", "AAAA", "CNAME"):
-        try:
-            resolver.resolve(fqdn, rtype)
-            return True
-        except dns.resolver.NXDOMAIN:
-            return False          # definitively does not exist
-        except dns.resolver.NoAnswer:
-            continue              # no record of this type; try next
-        except Exception:
-            continue
-    return False
-
-
-def _resolves_socket(fqdn: str, timeout: float) -> bool:
+async def _resolves_dnspython(resolver: "dns.asyncresolver.Resolver", fqdn: str) -> str:
+    # A single A query answers "does this name exist?": CNAME chains are
+    # followed by the resolver, and a CNAME-only name still shows its alias
+    # in the answer section of the NoAnswer response.
+    try:
+        await resolver.resolve(fqdn, "A")
+        return LIVE
+    except dns.resolver.NXDOMAIN:
+        return NXDOMAIN           # definitively does not exist
+    except dns.resolver.NoAnswer as exc:
+        answer = exc.response().answer
+        if any(rrset.rdtype == dns.rdatatype.CNAME for rrset in answer):
+            return LIVE
+        return MISS
+    except Exception:
+        return ERROR
+
+
+def _resolves_socket(fqdn: str, timeout: float) -> str:
+    # getaddrinfo() cannot tell NXDOMAIN from "no address records", so the
+    # socket fallback never reports NXDOMAIN.
     old = socket.getdefaulttimeout()
     try:
         socket.setdefaulttimeout(timeout)
         socket.getaddrinfo(fqdn, None)
-        return True
-    except socket.gaierror:
-        return False
+        return LIVE
+    except socket.gaierror as exc:
+        return ERROR if exc.errno == socket.EAI_AGAIN else MISS
     finally:
         socket.setdefaulttimeout(old)
 
 
-def resolves(fqdn: str, timeout: float) -> bool:
-    if _HAS_DNSPYTHON:
-        return _resolves_dnspython(fqdn, timeout)
-    return _resolves_socket(fqdn, timeout)
-
-# ── Blocklist parsing ─────────────────────────────────────────────────────────
-
-def parse_blocklist(path: pathlib.Path) -> tuple[list[str], set[str]]:
-    """
-    Returns (lines, known_domains).
-
-    `lines` preserves the full file structure (comments, blank lines, domain
-    entries) but silently drops any line whose domain already appeared earlier
-    in the file (intra-file deduplication).
-
-    `known_domains` is the lowercased set of all domain names in the file.
-    """
-    lines: list[str] = []
-    known: set[str] = set()
-
-    with open(path, encoding="utf-8") as fh:
-        for raw in fh:
-            line = raw.rstrip("\n")
-            stripped = line.strip()
-
-            if not stripped or stripped.startswith("#"):
-                lines.append(line)
-                continue
-
-            # Support both "domain.com" and "0.0.0.0 domain.com" formats.
-            parts = stripped.split()
-            domain = parts[-1].lower()
+async def _resolves_aiodns(resolver: "aiodns.DNSResolver", fqdn: str) -> str:
+    # aiodns 4 renamed query() to query_dns(); both raise DNSError on failure.
+    # One A query per name; c-ares follows CNAME chains to the address.
+    query = getattr(resolver, "query_dns", None) or resolver.query
+    try:
+        await query(fqdn, "A")
+        return LIVE
+    except aiodns.error.DNSError as exc:
+        code = exc.args[0] if exc.args else None
+        if code == _ARES_ENOTFOUND:
+            return NXDOMAIN       # definitively does not exist
+        if code == _ARES_ENODATA:
+            return MISS           # name exists but has no address
+        return ERROR              # timeout, SERVFAIL, refused…
 
-            if domain in known:
-                # Drop the duplicate silently.
-                continue
+# ── Result cache ──────────────────────────────────────────────────────────────
+# Maps fqdn -> {"live": bool, "nxdomain": bool, "ts": epoch seconds}.
+# ERROR results are never cached; they say nothing about the name.
 
-            known.add(domain)
-            lines.append(line)
+NEGATIVE_CACHE_TTL = 86400.0   # seconds; negative answers go stale faster
 
-    return lines, known
 
+def load_cache(path: pathlib.Path) -> dict[str, dict]:
+    """Return the cache stored at `path`, or an empty cache if unreadable."""
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_cache(path: pathlib.Path, cache: dict[str, dict], ttl: float) -> None:
+    """Atomically write `cache` to `path`, dropping entries older than `ttl`."""
+    cutoff = time.time() - ttl
+    fresh = {k: v for k, v in cache.items() if v.get("ts", 0) >= cutoff}
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(fresh, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(path)
+
+
+def cache_get(cache: dict[str, dict], fqdn: str, ttl: float) -> str | None:
+    """Return the cached status for `fqdn`, or None if absent or expired."""
+    entry = cache.get(fqdn)
+    if entry is None:
+        return None
+    age = time.time() - entry.get("ts", 0)
+    if entry.get("live"):
+        return LIVE if age < ttl else None
+    if age >= min(ttl, NEGATIVE_CACHE_TTL):
+        return None
+    return NXDOMAIN if entry.get("nxdomain") else MISS
+
+
+def cache_put(cache: dict[str, dict], fqdn: str, status: str) -> None:
+    if status != ERROR:
+        cache[fqdn] = {
+            "live": status == LIVE,
+            "nxdomain": status == NXDOMAIN,
+            "ts": int(time.time()),
+        }
+
+# ── Input parsing ──────────────────────────────────────────────────────────────
+# parse_blocklist() and is_blocked() live in blocklist_core.py.
 
 def parse_vendors(path: pathlib.Path) -> list[str]:
     """Return seed domains from vendors.txt, skipping blanks and comments."""
-    seeds: list[str] = []
-    with open(path, encoding="utf-8") as fh:
-        for raw in fh:
-            line = raw.strip()
-            if line and not line.startswith("#"):
-                seeds.append(line.lower())
-    return seeds
+    return [
+        line.lower()
+        for raw in path.read_text(encoding="utf-8").splitlines()
+        if (line := raw.strip()) and not line.startswith("#")
+    ]
 
 # ── Discovery ─────────────────────────────────────────────────────────────────
 
-def build_probe_list(seeds: list[str]) -> list[str]:
-    """Expand each seed into (seed itself) + (prefix.seed) for every prefix."""
-    probes: list[str] = []
-    seen: set[str] = set()
+class _BufferedLog:
+    """
+    Collects progress lines and writes them to stdout in batches — at most
+    every `interval` seconds or every `max_lines` lines — instead of paying
+    for a locked, flushed print() per probe.
+    """
+
+    def __init__(self, interval: float = 0.25, max_lines: int = 1000) -> None:
+        self._buf: list[str] = []
+        self._interval = interval
+        self._max_lines = max_lines
+        self._last_flush = time.monotonic()
 
-    def add(d: str) -> None:
-        if d not in seen:
-            seen.add(d)
-            probes.append(d)
+    def __call__(self, message: str) -> None:
+        self._buf.append(message + "\n")
+        if (len(self._buf) >= self._max_lines
+                or time.monotonic() - self._last_flush >= self._interval):
+            self.flush()
 
-    for seed in seeds:
-        add(seed)
-        for prefix in PREFIXES:
-            add(f"{prefix}.{seed}")
+    def flush(self) -> None:
+        if self._buf:
+            sys.stdout.write("".join(self._buf))
+            self._buf.clear()
+        sys.stdout.flush()
+        self._last_flush = time.monotonic()
 
-    return probes
 
 
-def discover(
+
+async def discover(
     seeds: list[str],
     known: set[str],
     workers: int,
     timeout: float,
     verbose: bool,
+    cache: dict[str, dict] | None = None,
+    cache_ttl: float = 0.0,
+    interval: float = 0.0,
+    nameservers: Sequence[str] = DEFAULT_NAMESERVERS,
 ) -> list[str]:
     """
-    Probe all (prefix, seed) combinations in parallel.
+    Probe every seed, then all (prefix, seed) combinations, concurrently.
     Returns newly discovered domains not already in `known`, sorted.
-    """
-    probes = [p for p in build_probe_list(seeds) if p not in known]
-    total  = len(probes)
-    found: list[str] = []
 
-    print(f"  Probing {total:,} candidates with {workers} workers "
-          f"(timeout {timeout}s each)…")
+    Seeds that are already blocked — themselves or via a parent entry — are
+    skipped outright: the app blocks everything beneath them anyway.
+
+    The first pass probes each bare seed plus a random sentinel label under
+    it. An NXDOMAIN seed has no subdomains to find, and a seed whose sentinel
+    resolves has a wildcard record that would make every prefix look live;
+    neither is expanded in the second pass.
+
+    With aiodns or dnspython every query is in flight on the event loop
+    itself; the socket fallback runs getaddrinfo() on a thread pool of
+    `workers` threads. Either way at most `workers` probes are outstanding
+    at once.
 
-    if not _HAS_DNSPYTHON:
-        print("  ⚠  dnspython not installed — using socket fallback "
-              "(less accurate NXDOMAIN detection).")
-        print("     Install with: pip install dnspython")
+    If `cache` is given, results younger than `cache_ttl` seconds are reused
+    instead of probed, and fresh results are stored back into it.
 
+    A non-zero `interval` spaces query submissions at least that many
+    seconds apart, capping the overall query rate.
+
+    Queries rotate across `nameservers`; the socket fallback cannot choose a
+    server and uses the system resolver.
+    """
+    found: list[str] = []
+    log = _BufferedLog()
+    loop = asyncio.get_running_loop()
+
+    pool: ThreadPoolExecutor | None = None
+
+    if _HAS_AIODNS:
+        # ares_query() never applies the resolv.conf search list.
+        aio_resolver = aiodns.DNSResolver(
+            nameservers=nameservers, timeout=timeout, tries=1, rotate=True,
+        )
+
+        async def lookup(fqdn: str) -> str:
+            return await _resolves_aiodns(aio_resolver, fqdn)
+    elif _HAS_DNSPYTHON:
+        # One shared resolver, configured explicitly rather than from
+        # resolv.conf: no search-domain expansion, EDNS0 with a 1232-byte
+        # payload (the DNS Flag Day 2020 size), and no retries on SERVFAIL.
+        dns_resolver = dns.asyncresolver.Resolver(configure=False)
+        dns_resolver.nameservers = list(nameservers)
+        dns_resolver.rotate = True
+        dns_resolver.search = []
+        dns_resolver.use_search_by_default = False
+        dns_resolver.use_edns(0, 0, 1232)
+        dns_resolver.retry_servfail = False
+        dns_resolver.lifetime = timeout
+
+        async def lookup(fqdn: str) -> str:
+            return await _resolves_dnspython(dns_resolver, fqdn)
+    else:
+        log("  ⚠  dnspython not installed — using socket fallback "
+            "(less accurate NXDOMAIN detection).")
+        log("     Install with: pip install dnspython")
+
+        pool = ThreadPoolExecutor(max_workers=workers)
+
+        async def lookup(fqdn: str) -> str:
+            return await loop.run_in_executor(pool, _resolves_socket, fqdn, timeout)
+
+    sem = asyncio.Semaphore(workers)
     completed = 0
-    with ThreadPoolExecutor(max_workers=workers) as pool:
-        futures = {pool.submit(resolves, fqdn, timeout): fqdn for fqdn in probes}
-        for future in as_completed(futures):
-            fqdn = futures[future]
-            completed += 1
+    total = 0
+    next_send = 0.0
+
+    async def _pace() -> None:
+        nonlocal next_send
+        now = loop.time()
+        send_at = max(now, next_send)
+        next_send = send_at + interval
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+
+    async def _query(fqdn: str) -> str:
+        async with sem:
+            if interval:
+                await _pace()
             try:
-                live = future.result()
+                return await lookup(fqdn)
             except Exception as exc:
                 if verbose:
-                    print(f"  [error] {fqdn}: {exc}")
-                continue
-
-            if live:
+                    log(f"  [error] {fqdn}: {exc}")
+                return ERROR
+
+    async def _probe(fqdn: str) -> str:
+        nonlocal completed
+        status = cache_get(cache, fqdn, cache_ttl) if cache is not None else None
+        if status is None:
+            status = await _query(fqdn)
+            if cache is not None:
+                cache_put(cache, fqdn, status)
+
+        completed += 1
+        if status == LIVE:
+            if fqdn not in known:
                 found.append(fqdn)
-                print(f"  [new]   {fqdn}")
-            elif verbose:
-                print(f"  [miss]  {fqdn}")
+                log(f"  [new]   {fqdn}")
+        elif verbose:
+            log(f"  [{status}]  {fqdn}")
 
-            if completed % 500 == 0:
-                print(f"  … {completed:,}/{total:,} probed, {len(found)} new so far")
+        if completed % 500 == 0:
+            log(f"  … {completed:,}/{total:,} probed, {len(found)} new so far")
+        return status
+
+    try:
+        unblocked = [seed for seed in seeds if not is_blocked(seed, known)]
+        if len(unblocked) < len(seeds):
+            log(f"  {len(seeds) - len(unblocked)} seed(s) already blocked "
+                f"by the blocklist — skipping.")
+        seeds = unblocked
+
+        # ── Pass 1: bare seeds and wildcard sentinels ────────────────────────
+        total = len(seeds)
+        log(f"  Probing {total:,} seed domains with {workers} workers "
+              f"(timeout {timeout}s each)…")
+
+        sentinels = [f"nxdomain-probe-{secrets.token_hex(6)}.{seed}" for seed in seeds]
+        statuses = await asyncio.gather(
+            *(_probe(seed) for seed in seeds),
+            *(_query(sentinel) for sentinel in sentinels),
+        )
+        seed_status, sentinel_status = statuses[:len(seeds)], statuses[len(seeds):]
+
+        dead_seeds = {s for s, st in zip(seeds, seed_status) if st == NXDOMAIN}
+        wildcard_seeds = {s for s, st in zip(seeds, sentinel_status) if st == LIVE}
+        for seed in sorted(wildcard_seeds):
+            log(f"  ⚠  {seed} has a wildcard DNS record — skipping prefix probes.")
+        if dead_seeds:
+            log(f"  {len(dead_seeds)} seed(s) returned NXDOMAIN — skipping prefix probes.")
+
+        # ── Pass 2: prefix expansions of the remaining seeds ─────────────────
+        probes = build_probe_list(seeds, dead_seeds, wildcard_seeds, known,
+                                  _DOTTED_PREFIXES)
+        total += len(probes)
+        log(f"  Probing {len(probes):,} candidates…")
+
+        await asyncio.gather(*(_probe(fqdn) for fqdn in probes))
+    finally:
+        log.flush()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
 
     return sorted(found)
 
@@ -244,38 +439,34 @@ DISCOVERY_FOOTER = """
 """
 
 
-def build_output(
+def write_output(
+    fh: TextIO,
     existing_lines: list[str],
     new_domains: list[str],
-) -> str:
+    generated_start: int | None,
+) -> None:
     """
-    Reconstruct the blocklist:
+    Stream the reconstructed blocklist to `fh`:
     - Existing content (deduped) verbatim.
-    - Remove any previous generated section if present.
+    - Remove any previous generated section, which parse_blocklist() located
+      at `generated_start`.
     - Append a fresh generated section for new_domains.
     """
-    # Strip any existing generated section (from a previous run).
-    cutoff = None
-    for i, line in enumerate(existing_lines):
-        if "DISCOVERED DOMAINS — generated" in line:
-            # Walk back to remove the preceding blank lines too.
-            cutoff = i
-            while cutoff > 0 and existing_lines[cutoff - 1].strip() == "":
-                cutoff -= 1
-            break
-
-    base_lines = existing_lines[:cutoff] if cutoff is not None else existing_lines
+    base_lines = existing_lines
+    if generated_start is not None:
+        base_lines = existing_lines[:generated_start]
 
-    parts: list[str] = ["\n".join(base_lines)]
+    for line in base_lines:
+        fh.write(line)
+        fh.write("\n")
 
     if new_domains:
         date_str = datetime.date.today().isoformat()
-        parts.append(DISCOVERY_HEADER_TEMPLATE.format(date=date_str))
-        for domain in new_domains:
-            parts.append(f"0.0.0.0 {domain}")
-        parts.append(DISCOVERY_FOOTER)
-
-    return "\n".join(parts) + "\n"
+        fh.write(DISCOVERY_HEADER_TEMPLATE.format(date=date_str))
+        fh.write("\n")
+        fh.writelines("0.0.0.0 " + domain + "\n" for domain in new_domains)
+        fh.write(DISCOVERY_FOOTER)
+        fh.write("\n")
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 
@@ -286,11 +477,25 @@ def main() -> None:
                         help="Discover and print but do not write to the blocklist.")
     parser.add_argument("--verbose",  action="store_true",
                         help="Log every DNS probe result.")
-    parser.add_argument("--workers",  type=int, default=50, metavar="N",
-                        help="Parallel DNS workers (default: 50).")
+    parser.add_argument("--workers",  type=int, default=None, metavar="N",
+                        help="Concurrent DNS queries "
+                             "(default: 2000 with aiodns, 500 with dnspython, else 50).")
     parser.add_argument("--timeout",  type=float, default=3.0, metavar="S",
                         help="DNS query timeout in seconds (default: 3).")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore and do not update the DNS result cache.")
+    parser.add_argument("--cache-ttl", type=float, default=7.0, metavar="D",
+                        help="Reuse cached live results for D days (default: 7).")
+    parser.add_argument("--interval", type=float, default=0.0, metavar="S",
+                        help="Minimum gap between DNS queries in seconds, "
+                             "e.g. 0.002 for 500 qps (default: 0, no limit).")
+    parser.add_argument("--nameserver", action="append", dest="nameservers",
+                        metavar="IP",
+                        help="Resolver to query; repeat for several "
+                             "(default: 1.1.1.1, 8.8.8.8, 9.9.9.9).")
     args = parser.parse_args()
+    if args.workers is None:
+        args.workers = 2000 if _HAS_AIODNS else 500 if _HAS_DNSPYTHON else 50
 
     # ── Validate inputs ───────────────────────────────────────────────────────
     if not VENDORS_FILE.exists():
@@ -304,12 +509,24 @@ def main() -> None:
     print(f"  {len(seeds)} seed domains loaded.")
 
     print(f"Reading blocklist from   {BLOCKLIST_FILE.relative_to(REPO_ROOT)}")
-    existing_lines, known_domains = parse_blocklist(BLOCKLIST_FILE)
+    existing_lines, known_domains, generated_start = parse_blocklist(BLOCKLIST_FILE)
     print(f"  {len(known_domains)} domains already in blocklist.")
 
+    cache = None
+    cache_ttl = args.cache_ttl * 86400
+    if not args.no_cache:
+        cache = load_cache(CACHE_FILE)
+        print(f"  {len(cache):,} cached DNS results loaded.")
+
     # ── Discover ──────────────────────────────────────────────────────────────
     print("\nStarting DNS discovery…")
-    new_domains = discover(seeds, known_domains, args.workers, args.timeout, args.verbose)
+    new_domains = asyncio.run(
+        discover(seeds, known_domains, args.workers, args.timeout, args.verbose,
+                 cache, cache_ttl, args.interval,
+                 args.nameservers or DEFAULT_NAMESERVERS)
+    )
+    if cache is not None:
+        save_cache(CACHE_FILE, cache, cache_ttl)
     print(f"\nDiscovery complete: {len(new_domains)} new domain(s) found.")
 
     if not new_domains:
@@ -317,8 +534,6 @@ def main() -> None:
         return
 
     # ── Write ─────────────────────────────────────────────────────────────────
-    output = build_output(existing_lines, new_domains)
-
     if args.dry_run:
         print("\n[dry-run] Would append the following domains:")
         for d in new_domains:
@@ -326,7 +541,8 @@ def main() -> None:
         print(f"\n[dry-run] Blocklist NOT modified.")
         return
 
-    BLOCKLIST_FILE.write_text(output, encoding="utf-8")
+    with open(BLOCKLIST_FILE, "w", encoding="utf-8", buffering=1 << 20) as fh:
+        write_output(fh, existing_lines, new_domains, generated_start)
     print(f"\nBlocklist updated: {BLOCKLIST_FILE.relative_to(REPO_ROOT)}")
     print(f"  Total domains now: {len(known_domains) + len(new_domains):,}")
     print(f"\nNext step: run scripts/sign_blocklist.py to re-sign the blocklist.")
@@ -7,7 +7,9 @@ with. The app holds the public key; only the holder of the private key can
 produce a valid signature.
 
 Usage:
-    BLOCKLIST_SIGNING_KEY=<base64> python scripts/sign_blocklist.py
+    BLOCKLIST_SIGNING_KEY=<base64> python scripts/sign_blocklist.py [--fast]
+
+    --fast   Skip the self-verification pass after signing.
 
 The BLOCKLIST_SIGNING_KEY environment variable must be a Base64-encoded
 string representing the 32-byte Ed25519 private-key seed.
@@ -30,6 +32,8 @@ Requires:
 
 import argparse
 import base64
+import contextlib
+import mmap
 import os
 import pathlib
 import secrets
@@ -46,10 +50,25 @@ ENV_KEY_NAME   = "BLOCKLIST_SIGNING_KEY"
 
 # ── Crypto helpers ────────────────────────────────────────────────────────────
 
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+        Ed25519PrivateKey,
+        Ed25519PublicKey,
+    )
+    from cryptography.hazmat.primitives.serialization import (
+        Encoding,
+        NoEncryption,
+        PrivateFormat,
+        PublicFormat,
+    )
+    _HAS_CRYPTOGRAPHY = True
+except ImportError:
+    _HAS_CRYPTOGRAPHY = False
+
+
 def _require_cryptography() -> None:
-    try:
-        import cryptography  # noqa: F401
-    except ImportError:
+    if not _HAS_CRYPTOGRAPHY:
         sys.exit(
             "Error: the 'cryptography' package is required.\n"
             "Install with: pip install cryptography"
@@ -59,9 +78,6 @@ def _require_cryptography() -> None:
 def generate_keypair() -> tuple[bytes, bytes]:
     """Return (private_key_seed_bytes, public_key_bytes) for a new Ed25519 key."""
     _require_cryptography()
-    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
-    from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat, PrivateFormat, NoEncryption
-
     private_key = Ed25519PrivateKey.generate()
     seed = private_key.private_bytes(Encoding.Raw, PrivateFormat.Raw, NoEncryption())
     public = private_key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
@@ -69,11 +85,14 @@ def generate_keypair() -> tuple[bytes, bytes]:
 
 
 def sign(data: bytes, seed: bytes) -> bytes:
-    """Return the 64-byte Ed25519 signature of `data`."""
-    _require_cryptography()
-    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
-    from cryptography.hazmat.primitives.serialization import Encoding, PrivateFormat, NoEncryption
+    """
+    Return the 64-byte Ed25519 signature of `data`.
 
+    This is pure Ed25519, not the pre-hashed Ed25519ph variant: the app
+    verifies with BouncyCastle's Ed25519Signer, so `data` must be the whole
+    message rather than a streamed digest of it.
+    """
+    _require_cryptography()
     private_key = Ed25519PrivateKey.from_private_bytes(seed)
     return private_key.sign(data)
 
@@ -81,9 +100,6 @@ def sign(data: bytes, seed: bytes) -> bytes:
 def public_key_from_seed(seed: bytes) -> bytes:
     """Derive and return the 32-byte public key for a given seed."""
     _require_cryptography()
-    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
-    from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
-
     private_key = Ed25519PrivateKey.from_private_bytes(seed)
     return private_key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
 
@@ -91,17 +107,62 @@ def public_key_from_seed(seed: bytes) -> bytes:
 def verify(data: bytes, signature: bytes, public_key_bytes: bytes) -> bool:
     """Return True if the signature is valid for data under public_key_bytes."""
     _require_cryptography()
-    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
-    from cryptography.exceptions import InvalidSignature
-
     try:
-        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
         public_key = Ed25519PublicKey.from_public_bytes(public_key_bytes)
         public_key.verify(signature, data)
         return True
     except InvalidSignature:
         return False
 
+# ── Blocklist loading ─────────────────────────────────────────────────────────
+
+_CHUNK_SIZE = 1 << 20
+
+
+def _crlf_to_lf(mm: mmap.mmap) -> bytearray:
+    """
+    Return a copy of `mm` with CRLF line endings replaced by LF.
+
+    The result is preallocated at the file's size and filled 1 MiB at a time,
+    so peak memory is one copy of the file rather than the two a
+    slice-then-replace would take.
+    """
+    out = bytearray(len(mm))
+    size = 0
+    pos = 0
+    while pos < len(mm):
+        end = pos + _CHUNK_SIZE
+        if mm[end - 1:end] == b"\r":
+            end -= 1              # carry a trailing CR into the next chunk
+        chunk = mm[pos:end].replace(b"\r\n", b"\n")
+        out[size:size + len(chunk)] = chunk
+        size += len(chunk)
+        pos = end
+    del out[size:]
+    return out
+
+
+@contextlib.contextmanager
+def open_blocklist(path: pathlib.Path):
+    """
+    Yield the blocklist contents as a bytes-like object with LF line endings.
+
+    The file is memory-mapped rather than read into a bytes object; only a
+    file containing CRLF line endings is copied (to normalise them), and then
+    only once.
+    """
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            yield b""               # mmap cannot map an empty file
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Normalise to LF so the signature matches what GitHub raw serves,
+            # regardless of local line-ending settings (e.g. git autocrlf on Windows).
+            if mm.find(b"\r\n") == -1:
+                yield mm
+            else:
+                yield _crlf_to_lf(mm)
+
 # ── Key loading ───────────────────────────────────────────────────────────────
 
 def load_seed_from_env() -> bytes:
@@ -141,24 +202,22 @@ def load_seed_from_env() -> bytes:
 # ── .sig file format ──────────────────────────────────────────────────────────
 
 def write_sig_file(path: pathlib.Path, signature: bytes) -> None:
-    sig_b64 = base64.b64encode(signature).decode("ascii")
-    path.write_text(
-        f"algorithm: ed25519\n"
-        f"signature: {sig_b64}\n",
-        encoding="utf-8",
+    path.write_bytes(
+        b"algorithm: ed25519\n"
+        b"signature: " + base64.b64encode(signature) + b"\n"
     )
 
 
 def read_sig_file(path: pathlib.Path) -> bytes:
     lines = {
         k.strip(): v.strip()
-        for line in path.read_text(encoding="utf-8").splitlines()
-        if ":" in line
-        for k, v in [line.split(":", 1)]
+        for line in path.read_bytes().splitlines()
+        if b":" in line
+        for k, v in [line.split(b":", 1)]
     }
-    if lines.get("algorithm") != "ed25519":
+    if lines.get(b"algorithm") != b"ed25519":
         sys.exit(f"Error: unsupported algorithm in {path}")
-    return base64.b64decode(lines["signature"])
+    return base64.b64decode(lines[b"signature"])
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 
@@ -183,21 +242,20 @@ def cmd_generate_key() -> None:
     print("=" * 72)
 
 
-def cmd_sign() -> None:
+def cmd_sign(fast: bool = False) -> None:
     if not BLOCKLIST_FILE.exists():
         sys.exit(f"Error: blocklist not found at {BLOCKLIST_FILE}")
 
     seed = load_seed_from_env()
     public_key = public_key_from_seed(seed)
 
-    # Normalise to LF so the signature matches what GitHub raw serves,
-    # regardless of local line-ending settings (e.g. git autocrlf on Windows).
-    blocklist_bytes = BLOCKLIST_FILE.read_bytes().replace(b'\r\n', b'\n')
-    signature = sign(blocklist_bytes, seed)
+    with open_blocklist(BLOCKLIST_FILE) as blocklist_bytes:
+        signature = sign(blocklist_bytes, seed)
 
-    # Self-verify before writing — catch key/data mismatch immediately.
-    if not verify(blocklist_bytes, signature, public_key):
-        sys.exit("Error: self-verification failed. The signature is invalid.")
+        # Self-verify before writing — catch key/data mismatch immediately.
+        # Ed25519 signing is deterministic, so --fast may skip this second pass.
+        if not fast and not verify(blocklist_bytes, signature, public_key):
+            sys.exit("Error: self-verification failed. The signature is invalid.")
 
     write_sig_file(SIG_FILE, signature)
 
@@ -220,10 +278,12 @@ def cmd_verify() -> None:
     seed = load_seed_from_env()
     public_key = public_key_from_seed(seed)
 
-    blocklist_bytes = BLOCKLIST_FILE.read_bytes().replace(b'\r\n', b'\n')
     signature = read_sig_file(SIG_FILE)
 
-    if verify(blocklist_bytes, signature, public_key):
+    with open_blocklist(BLOCKLIST_FILE) as blocklist_bytes:
+        valid = verify(blocklist_bytes, signature, public_key)
+
+    if valid:
         print("✓ Signature is valid.")
     else:
         sys.exit("✗ Signature is INVALID. The blocklist may have been tampered with.")
@@ -246,6 +306,11 @@ def main() -> None:
         action="store_true",
         help=f"Verify the existing .sig file against {ENV_KEY_NAME}.",
     )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Skip the self-verification pass after signing.",
+    )
 
     args = parser.parse_args()
 
@@ -256,7 +321,7 @@ def main() -> None:
     elif args.verify:
         cmd_verify()
     else:
-        cmd_sign()
+        cmd_sign(fast=args.fast)
 
 
 if __name__ == "__main__":